@@ -1,249 +1,481 @@
-import random
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+
+INT_MAX = np.iinfo(np.int32).max  # 掩码外元素的填充值，保证 argmin 不会选中
+INT64_MAX = np.iinfo(np.int64).max
+ACTIVE_PENALTY = INT_MAX    # LINUX_NG: Active 页面的优先级偏移，大于任何访问时间
+# 生成阶段的指令格式，pid 为 -1 表示单进程
+INSTRUCTION_DTYPE = np.dtype([("addr", np.int16), ("is_write", np.bool_), ("pid", np.int32)])
+
+class AlgoResult:
+    """单个算法最近一次访问的结果：每个算法持有一个实例，每次访问原地更新，调用方只读不写"""
+    __slots__ = ("status", "swapped", "swapped_pid", "is_write_back", "miss_rate", "miss_count", "wb_count")
+
+    def __init__(self):
+        self.status = None
+        self.swapped = None     #被交换的页号
+        self.swapped_pid = None
+        self.is_write_back = False
+        self.miss_rate = 0.0
+        self.miss_count = 0
+        self.wb_count = 0
+
+
+# step() 的返回值：results 为 {算法名: AlgoResult}，frame 为当前查看算法中装有本次访问页面的帧号
+StepResult = namedtuple("StepResult", "inst op page pid frame results view_algo memory next_victim current_step")
+
 
 class AlgoState:
+    """页面置换算法的公共状态与缺页处理流程，具体策略由子类实现"""
+    name = None
+    snapshot_uses_time = False  # 快照内容是否依赖当前时刻（空闲时间类显示）
 
-    def __init__(self, name, memory_blocks):
-        self.name = name
+    def __init__(self, memory_blocks):
         self.memory_blocks = memory_blocks #内存块大小
-        self.memory = [None] * memory_blocks #内存块
+
+        # 内存块：按字段拆分的并行数组（SoA），valid 标记该帧是否已装入页面；内容由 reset() 填充
+        self.page = np.empty(memory_blocks, dtype=np.int32)
+        self.pid = np.empty(memory_blocks, dtype=np.int32)    # -1 表示单进程（无 pid）
+        self.loaded_at = np.empty(memory_blocks, dtype=np.int32)
+        self.last_access = np.empty(memory_blocks, dtype=np.int32)
+        self.dirty = np.empty(memory_blocks, dtype=np.bool_)
+        self.is_active = np.empty(memory_blocks, dtype=np.bool_)  # LINUX_NG: 是否在 Active 列表
+        self.valid = np.empty(memory_blocks, dtype=np.bool_)
+        # 命中索引：(pid, 页号) -> 帧号，随装入/换出同步维护；valid_mask 第 i 位为帧 i 的 valid
+        self.page_to_idx = {}
+        self.full_mask = (1 << memory_blocks) - 1
+        # 最近一次访问的结果：每次访问原地更新并返回同一个对象
+        self.last_result = AlgoResult()
+        self.reset()
+
+    """原地清空状态，复用已分配的数组（块数不变时代替重新构造）"""
+    def reset(self):
+        self.page.fill(-1)
+        self.pid.fill(-1)
+        self.loaded_at.fill(0)
+        self.last_access.fill(0)
+        self.dirty.fill(False)
+        self.is_active.fill(False)
+        self.valid.fill(False)
+        self.page_to_idx.clear()
+        self.valid_mask = 0
 
         # 统计数据
         self.miss_count = 0
         self.total_count = 0
         self.write_back_count = 0
+        self.miss_rate = 0.0    # 缺页率（%），每次访问后更新
+        self.last_result.__init__()
 
         # 算法辅助变量
         self.load_counter = 0   # FIFO 装入顺序计数器
-        self.clock_hand = 0     # Clock 算法指针位置
+
+        # 快照缓存：内存状态变化后置脏；LRU/LINUX_NG 的空闲时间依赖当前时刻，缓存需按时刻区分
+        self._snapshot_cache = None
+        self._snapshot_time = None
+        self._snapshot_dirty = True
 
     """处理一次内存访问请求"""
-    def process(self, page_id, op_type, current_time, future_pages=None, pid=None):
+    def process(self, page_id, op_type, current_time, page_occurrences=None, pid=None):
+        res = self._access(page_id, op_type, current_time, page_occurrences, pid)
+        self._update_miss_rate()
+        return res
+
+    """批量处理一段指令（不生成逐步结果），start_time 为第一条指令的时间戳；缺页率只在结束时计算一次"""
+    def process_batch(self, instructions, start_time, page_occurrences=None):
+        access = self._access
+        for t, (_, op_type, pid, page_id) in enumerate(instructions, start_time):
+            access(page_id, op_type, t, page_occurrences, pid)
+        self._update_miss_rate()
+
+    """命中/缺页处理，不计算缺页率"""
+    def _access(self, page_id, op_type, current_time, page_occurrences, pid):
         self.total_count += 1
-        # 查找页面：多进程模式下需同时匹配 (pid, page_id)
-        hit_idx = -1
-        for i, frame in enumerate(self.memory):
-            if frame is not None and frame['page'] == page_id:
-                # 单进程：pid 为 None 直接匹配；多进程：需匹配 pid
-                if pid is None or frame.get('pid') == pid:
-                    hit_idx = i
-                    break
+        # 查找页面：多进程模式下需同时匹配 (pid, page_id)，单进程时 pid 为 None
+        hit_idx = self.page_to_idx.get((pid, page_id), -1)
 
         if hit_idx != -1:   #说明内存块已经存在该页
-            return self._handle_hit(hit_idx, op_type, current_time, pid)
+            res = self._handle_hit(hit_idx, op_type, current_time, pid)
         else:
-            return self._handle_miss(page_id, op_type, current_time, future_pages, pid)
+            res = self._handle_miss(page_id, op_type, current_time, page_occurrences, pid)
+        self._snapshot_dirty = True    # 命中/缺页（含列表平衡、时钟扫描）都会改变内存状态
+        return res
+
+    """更新缺页率（%）并写入最近一次结果"""
+    def _update_miss_rate(self):
+        if self.total_count:
+            self.miss_rate = (self.miss_count / self.total_count) * 100
+        self.last_result.miss_rate = self.miss_rate
 
     """处理页面命中"""
     def _handle_hit(self, idx, op_type, current_time, pid=None):
-        frame = self.memory[idx]
-        frame['last_access'] = current_time
+        self.last_access[idx] = current_time
 
         # 算法特定的命中处理
-        if self.name == "LINUX":
-            frame['ref_bit'] = 1
-        elif self.name == "LINUX_NG":
-            frame['is_active_list'] = True
-            self._balance_lists()   #维护 Active/Inactive 列表平衡
+        self._on_hit(idx)
 
         # 写操作时标记脏页
         if op_type == 'W':
-            frame['dirty'] = True
+            self.dirty[idx] = True
 
-        return {"status": "Hit", "swapped": None, "swapped_pid": None, "is_write_back": False}
+        res = self.last_result
+        res.status = "Hit"
+        res.swapped = None
+        res.swapped_pid = None
+        res.is_write_back = False
+        return res
 
     """处理缺页中断"""
-    def _handle_miss(self, page_id, op_type, current_time, future_pages, pid=None):
+    def _handle_miss(self, page_id, op_type, current_time, page_occurrences, pid=None):
         self.miss_count += 1
         self.load_counter += 1
         is_write_back = False
         swapped_out = None
         swapped_pid = None
 
-        # 创建新页
-        new_frame = {
-            "page": page_id,
-            "pid": pid,
-            "loaded_at": self.load_counter,
-            "last_access": current_time,
-            "ref_bit": 1,
-            "dirty": (op_type == 'W'),
-            "is_active_list": False  # LINUX_NG: 新页面默认放入 Inactive 列表
-        }
-
-        # 查找空闲帧
-        target_idx = -1
-        for i in range(self.memory_blocks):
-            if self.memory[i] is None:
-                target_idx = i
-                break
-
-        # 无空闲帧时执行页面置换
-        if target_idx == -1:
-            target_idx = self._get_victim(future_pages)
-            victim_frame = self.memory[target_idx]
-            swapped_out = victim_frame['page']  #被交换的页号
-            swapped_pid = victim_frame.get('pid')
+        # 查找空闲帧：valid_mask 中最低的 0 位
+        free = ~self.valid_mask & self.full_mask
+        if free:
+            target_idx = (free & -free).bit_length() - 1
+        else:
+            # 无空闲帧时执行页面置换
+            target_idx = self._pick_victim(current_time + 1, page_occurrences)
+            swapped_out = int(self.page[target_idx])  #被交换的页号
+            swapped_pid = self._pid_at(target_idx)
+            del self.page_to_idx[(swapped_pid, swapped_out)]
+            self._on_evict(target_idx)
 
             # 检查是否需要写回磁盘
-            if victim_frame.get('dirty'):
+            if self.dirty[target_idx]:
                 self.write_back_count += 1
                 is_write_back = True
 
-        # 3. 装入新页面
-        self.memory[target_idx] = new_frame
+        # 装入新页面
+        self.page[target_idx] = page_id
+        self.pid[target_idx] = -1 if pid is None else pid
+        self.loaded_at[target_idx] = self.load_counter
+        self.last_access[target_idx] = current_time
+        self.dirty[target_idx] = (op_type == 'W')
+        self.is_active[target_idx] = False   # LINUX_NG: 新页面默认放入 Inactive 列表
+        self.valid[target_idx] = True
+        self.valid_mask |= 1 << target_idx
+        self.page_to_idx[(pid, page_id)] = target_idx
+        self._on_load(target_idx)
+
+        res = self.last_result
+        res.status = "Miss"
+        res.swapped = swapped_out
+        res.swapped_pid = swapped_pid
+        res.is_write_back = is_write_back
+        res.miss_count = self.miss_count
+        res.wb_count = self.write_back_count
+        return res
+
+    """读取帧的进程号，单进程帧返回 None"""
+    def _pid_at(self, idx):
+        pid = int(self.pid[idx])
+        return None if pid == -1 else pid
+
+    """命中后的算法特定处理"""
+    def _on_hit(self, idx):
+        pass
+
+    """帧被换出前的算法特定处理"""
+    def _on_evict(self, idx):
+        pass
+
+    """新页面装入后的算法特定处理"""
+    def _on_load(self, idx):
+        pass
+
+    """找被置换的页面的位置，future_start 为未来序列的起始时间"""
+    def _pick_victim(self, future_start, page_occurrences):
+        raise NotImplementedError
 
-        # Clock 算法特殊处理：装入后指针下移
-        if self.name == "LINUX":
-            self.clock_hand = (target_idx + 1) % self.memory_blocks
+    """预测下一个被置换的页面"""
+    def predict_next_victim(self, current_time=0, page_occurrences=None):
+        if self.valid_mask != self.full_mask:
+            return -1
+        return self._predict_victim(current_time, page_occurrences)
 
-        return {"status": "Miss", "swapped": swapped_out, "swapped_pid": swapped_pid, "is_write_back": is_write_back}
+    """预测时不得修改算法状态；默认策略本身是只读的"""
+    def _predict_victim(self, future_start, page_occurrences):
+        return self._pick_victim(future_start, page_occurrences)
 
-    """LINUX_NG: 维护 Active/Inactive 列表平衡"""
-    def _balance_lists(self):
-        active_frames = [f for f in self.memory if f and f.get('is_active_list')]
-        #如果活跃的页表大于内存大小的一半，则需要最早加入的页放入Inactive列表
-        if len(active_frames) > self.memory_blocks // 2:
-            victim = min(active_frames, key=lambda x: x['last_access'])
-            victim['is_active_list'] = False
-
-    """找被置换的页面的位置"""
-    def _get_victim(self, future_pages=None):
-        valid_frames = [f for f in self.memory if f is not None]
-
-        # 先进先出
-        if self.name == "FIFO":
-            victim = min(valid_frames, key=lambda x: x['loaded_at'])
-            return self.memory.index(victim)
-        #最久未使用
-        elif self.name == "LRU":
-            victim = min(valid_frames, key=lambda x: x['last_access'])
-            return self.memory.index(victim)
-        #最优
-        elif self.name == "OPT":
-            return self._get_opt_victim(future_pages)
-
-        elif self.name == "LINUX":
-            return self._run_clock_algorithm()
-
-        elif self.name == "LINUX_NG":
-            inactive = [f for f in valid_frames if not f.get('is_active_list')]  # inactive列表
-            pool = inactive if inactive else valid_frames   #inactive为空则进行LRU
-            victim = min(pool, key=lambda x: x['last_access'])
-            return self.memory.index(victim)
-
-        return 0
-
-    """OPT 算法：选择未来最晚使用的页面"""
-    def _get_opt_victim(self, future_pages):
-        if future_pages is None:
-            return 0
-        max_dist = -1   #在序列的位置
-        victim_idx = -1 #内存块的位置
-        for i, frame in enumerate(self.memory):
-            try:
-                #后续页面的最早位置
-                dist = future_pages.index(frame['page'])
-            except ValueError:
-                dist = 99999  # 未来不再使用
-            if dist > max_dist:
-                max_dist = dist
-                victim_idx = i
-        return victim_idx
+    """帧的附加显示信息"""
+    def _snapshot_meta(self, idx, current_time):
+        return ""
 
-    """ Clock 算法：选择最近未用的页面"""
-    def _run_clock_algorithm(self):
-        temp_hand = self.clock_hand
-        # 防止死循环：最多遍历 2 圈 + 1
-        for _ in range(self.memory_blocks * 2 + 1):
-            frame = self.memory[temp_hand]
-            if frame['ref_bit'] == 1:
-                frame['ref_bit'] = 0
-                temp_hand = (temp_hand + 1) % self.memory_blocks
-            else:
-                victim_idx = temp_hand
-                self.clock_hand = (temp_hand + 1) % self.memory_blocks
-                return victim_idx
-        return temp_hand
+    """帧是否为时钟指针所在位置"""
+    def _is_hand(self, idx):
+        return False
 
-    """预测下一个被置换的页面"""
-    def predict_next_victim(self, future_pages=None):
-        if None in self.memory:
-            return -1
-        if self.name == "LINUX":    #防止改变内存的链表
-            temp_hand = self.clock_hand
-            for _ in range(self.memory_blocks * 2):
-                if self.memory[temp_hand]['ref_bit'] == 0:
-                    return temp_hand
-                temp_hand = (temp_hand + 1) % self.memory_blocks
-            return temp_hand
-        else:
-            return self._get_victim(future_pages)
-
-    """特殊数据的展示"""
+    """特殊数据的展示，仅在 UI 边界把数组还原为字典"""
     def get_snapshot(self, current_time):
+        snapshot_time = current_time if self.snapshot_uses_time else None
+        if not self._snapshot_dirty and self._snapshot_time == snapshot_time:
+            return self._snapshot_cache
+
         snapshot = []
-        for i, f in enumerate(self.memory):
-            if f is None:
+        for i in range(self.memory_blocks):
+            if not self.valid[i]:
                 snapshot.append(None)
                 continue
-            meta = ""
-            if self.name == "FIFO":
-                meta = f"SEQ:{f['loaded_at']}"
-            elif self.name == "LRU":
-                meta = f"IDLE:{current_time - f['last_access']}"
-            elif self.name == "LINUX":
-                meta = f"REF:{f['ref_bit']}"
-            elif self.name == "LINUX_NG":
-                list_name = "ACT" if f.get('is_active_list') else "INA"
-                meta = f"{list_name}:{current_time - f['last_access']}"
-            elif self.name == "OPT":
-                meta = "OPT"
+            meta = self._snapshot_meta(i, current_time)
 
             # 脏页标记优先显示
-            if f.get('dirty'):
+            is_dirty = bool(self.dirty[i])
+            if is_dirty:
                 meta = "DIRTY"
 
             snapshot.append({
-                "page": f['page'],
-                "pid": f.get('pid'),
+                "page": int(self.page[i]),
+                "pid": self._pid_at(i),
                 "meta": meta,
-                "is_hand": (self.name == "LINUX" and i == self.clock_hand),
-                "is_dirty": f.get('dirty'),
-                "is_active_list": f.get('is_active_list')
+                "is_hand": self._is_hand(i),
+                "is_dirty": is_dirty,
+                "is_active_list": bool(self.is_active[i])
             })
+        self._snapshot_cache = snapshot
+        self._snapshot_time = snapshot_time
+        self._snapshot_dirty = False
         return snapshot
 
+
+class OrderedListState(AlgoState):
+    """用双向链表维护帧的淘汰顺序：表头为下一个被置换的帧，新装入/刚访问的帧放到表尾
+    prev/next 为帧号数组，下标 memory_blocks 为哨兵结点"""
+
+    def __init__(self, memory_blocks):
+        self.sentinel = memory_blocks
+        self.prev = np.empty(memory_blocks + 1, dtype=np.int32)
+        self.next = np.empty(memory_blocks + 1, dtype=np.int32)
+        super().__init__(memory_blocks)
+
+    # 清空链表：只剩哨兵结点
+    def reset(self):
+        super().reset()
+        self.prev.fill(self.sentinel)
+        self.next.fill(self.sentinel)
+
+    def _unlink(self, idx):
+        p, n = self.prev[idx], self.next[idx]
+        self.next[p] = n
+        self.prev[n] = p
+
+    def _push_back(self, idx):
+        tail = self.prev[self.sentinel]
+        self.next[tail] = idx
+        self.prev[idx] = tail
+        self.next[idx] = self.sentinel
+        self.prev[self.sentinel] = idx
+
+    def _on_evict(self, idx):
+        self._unlink(idx)
+
+    def _on_load(self, idx):
+        self._push_back(idx)
+
+    def _pick_victim(self, future_start, page_occurrences):
+        return int(self.next[self.sentinel])
+
+
+class FIFOState(OrderedListState):
+    """先进先出：链表按装入顺序排列"""
+    name = "FIFO"
+
+    def _snapshot_meta(self, idx, current_time):
+        return f"SEQ:{self.loaded_at[idx]}"
+
+
+class LRUState(OrderedListState):
+    """最久未使用：命中时把帧移到表尾，表头即最久未用"""
+    name = "LRU"
+    snapshot_uses_time = True
+
+    def _on_hit(self, idx):
+        self._unlink(idx)
+        self._push_back(idx)
+
+    def _snapshot_meta(self, idx, current_time):
+        return f"IDLE:{current_time - self.last_access[idx]}"
+
+
+class OPTState(AlgoState):
+    """最优置换：选择未来最晚使用的页面"""
+    name = "OPT"
+
+    def _pick_victim(self, future_start, page_occurrences):
+        if page_occurrences is None:
+            return 0
+        max_dist = -1   #在序列的位置
+        victim_idx = -1 #内存块的位置
+        for i in range(self.memory_blocks):
+            #后续页面的最早位置：在该页的出现时刻表中二分查找
+            occurrences = page_occurrences.get(int(self.page[i]), ())
+            j = bisect_left(occurrences, future_start)
+            if j == len(occurrences):
+                return i    # 未来不再使用的页面一定是最优选择，无需继续比较
+            dist = occurrences[j]
+            if dist > max_dist:
+                max_dist = dist
+                victim_idx = i
+        return victim_idx
+
+    def _snapshot_meta(self, idx, current_time):
+        return "OPT"
+
+
+class ClockState(AlgoState):
+    """LINUX: Clock 算法，选择最近未用的页面"""
+    name = "LINUX"
+
+    def reset(self):
+        super().reset()
+        self.clock_hand = 0     # Clock 算法指针位置
+        self.ref_mask = 0       # 引用位掩码：第 i 位为帧 i 的引用位
+
+    def _on_hit(self, idx):
+        self.ref_mask |= 1 << idx
+
+    # 装入后置引用位，指针下移
+    def _on_load(self, idx):
+        self.ref_mask |= 1 << idx
+        self.clock_hand = (idx + 1) % self.memory_blocks
+
+    """把掩码循环右移 hand 位，使第 0 位对应指针所在帧"""
+    def _rotate(self, mask, hand):
+        return ((mask >> hand) | (mask << (self.memory_blocks - hand))) & self.full_mask
+
+    """从指针开始第一个引用位为 0 的帧相对指针的偏移；全为 1 时返回 -1"""
+    def _first_clear(self):
+        clear = ~self._rotate(self.ref_mask, self.clock_hand) & self.full_mask
+        return (clear & -clear).bit_length() - 1
+
+    def _pick_victim(self, future_start, page_occurrences):
+        n = self.memory_blocks
+        hand = self.clock_hand
+        offset = self._first_clear()
+        if offset == -1:
+            # 全部被引用：转一圈清零所有引用位后回到指针处
+            self.ref_mask = 0
+            victim_idx = hand
+        else:
+            # 指针扫过的帧（hand 到 victim 之前）引用位清零
+            swept = (1 << offset) - 1
+            self.ref_mask &= ~self._rotate(swept, n - hand)
+            victim_idx = (hand + offset) % n
+        self.clock_hand = (victim_idx + 1) % n
+        return victim_idx
+
+    #防止改变内存的链表
+    def _predict_victim(self, future_start, page_occurrences):
+        offset = self._first_clear()
+        return self.clock_hand if offset == -1 else (self.clock_hand + offset) % self.memory_blocks
+
+    def _snapshot_meta(self, idx, current_time):
+        return f"REF:{(self.ref_mask >> idx) & 1}"
+
+    def _is_hand(self, idx):
+        return idx == self.clock_hand
+
+
+class ClockProState(AlgoState):
+    """LINUX_NG: 改进的 Linux 算法，维护 Active/Inactive 两个列表"""
+    name = "LINUX_NG"
+    snapshot_uses_time = True
+
+    def reset(self):
+        super().reset()
+        self.active_count = 0   # Active 列表中的页面数
+
+    def _on_hit(self, idx):
+        if not self.is_active[idx]:
+            self.is_active[idx] = True
+            self.active_count += 1
+            self._balance_lists()   #维护 Active/Inactive 列表平衡
+
+    def _on_evict(self, idx):
+        if self.is_active[idx]:
+            self.active_count -= 1
+
+    """维护 Active/Inactive 列表平衡"""
+    def _balance_lists(self):
+        #如果活跃的页表大于内存大小的一半，则需要最早加入的页放入Inactive列表
+        if self.active_count <= self.memory_blocks // 2:
+            return
+        victim = np.argmin(np.where(self.is_active, self.last_access, INT_MAX))
+        self.is_active[victim] = False
+        self.active_count -= 1
+
+    def _pick_victim(self, future_start, page_occurrences):
+        # Active 页面的优先级整体抬高，inactive 列表非空时必然先选中；为空时退化为全体 LRU
+        priority = self.last_access + self.is_active.astype(np.int64) * ACTIVE_PENALTY
+        return int(np.argmin(np.where(self.valid, priority, INT64_MAX)))
+
+    def _snapshot_meta(self, idx, current_time):
+        list_name = "ACT" if self.is_active[idx] else "INA"
+        return f"{list_name}:{current_time - self.last_access[idx]}"
+
+
+# 算法名到实现类的映射，PageManager 按此顺序并行运行
+ALGO_CLASSES = {
+    cls.name: cls
+    for cls in (FIFOState, LRUState, OPTState, ClockState, ClockProState)
+}
+
 class PageManager:
 
-    def __init__(self, total_instructions=2000, total_pages=32, memory_blocks=4, mode="single", num_processes=1):
+    def __init__(self, total_instructions=2000, total_pages=32, memory_blocks=4, mode="single", num_processes=1, seed=None):
         self.total_instructions = total_instructions  # 总指令数
         self.memory_blocks = memory_blocks  # 物理内存块数
         self.total_pages = total_pages  # 虚拟页面总数
         self.mode = mode  # "single" 或 "multi"
         self.num_processes = num_processes if mode == "multi" else 1 #进程数
         self.process_info = {}  # 进程字典，存放进程下的序列
+        self.rng = np.random.default_rng(seed)  # 批量生成随机指令；给定 seed 时序列可复现
 
         if self.mode == "multi":
             self._initialize_processes()
 
         # 并行五种算法
         self.algos = {
-            name: AlgoState(name, memory_blocks)
-            for name in ["FIFO", "LRU", "OPT", "LINUX", "LINUX_NG"]
+            name: cls(memory_blocks)
+            for name, cls in ALGO_CLASSES.items()
         }
+        # 每步的结果表：各算法的结果对象在访问时原地更新，表本身只建一次
+        self.step_results = {name: algo.last_result for name, algo in self.algos.items()}
         self.reset()
 
-    """开始模拟状态"""
-    def reset(self):
+    """开始模拟状态，给定 seed 时用它重新初始化随机数生成器"""
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
         self.current_time = 0   #时间戳
         self.view_algo_name = "FIFO"
         self.instructions = self._generate_instructions()
+        self._build_page_occurrences()
         self.reset_algos()
 
     """重置所有算法的状态"""
     def reset_algos(self):
         for algo in self.algos.values():
-            algo.__init__(algo.name, self.memory_blocks)
+            algo.reset()
+
+    """建立页号流与页号到访问时刻（升序）的索引，供 OPT 查找下一次使用"""
+    def _build_page_occurrences(self):
+        # 页号流随指令序列一次建好，整段模拟直接传给编译内核
+        self.page_stream = np.fromiter((inst[3] for inst in self.instructions), dtype=np.int32, count=len(self.instructions))
+        # 稳定排序后按页号分组，每组即该页的访问时刻（升序）；转为列表供 bisect 逐个查找
+        order = np.argsort(self.page_stream, kind="stable")
+        sorted_pages = self.page_stream[order]
+        starts = np.flatnonzero(np.diff(sorted_pages, prepend=-1))   # 每组的起始位置
+        self.page_occurrences = {
+            page: times.tolist()
+            for page, times in zip(sorted_pages[starts].tolist(), np.split(order, starts[1:]))
+        }
 
     """初始化多进程"""
     def _initialize_processes(self):
@@ -254,21 +486,21 @@ class PageManager:
                 "color": colors[i % len(colors)],
             }
 
-    """为单个进程生成随机序列"""
-    def _generate_process_sequence(self, hot_range, cold_range, length):
-        insts = []
-        # 为模拟真实程序的局部性原理95% 概率访问热区页面，5% 访问冷区页面
-        for _ in range(length):
-            if random.random() < 0.95:
-                # 热区访问
-                addr = random.randint(hot_range[0], hot_range[1] - 1)
-                op = 'W' if random.random() < 0.5 else 'R'
-            else:
-                # 冷区访问
-                addr = random.randint(cold_range[0], cold_range[1] - 1)
-                op = 'W' if random.random() < 0.1 else 'R'
-            insts.append((addr, op))
-        return insts
+    """为单个进程生成随机序列，返回 INSTRUCTION_DTYPE 结构化数组（单进程 pid 为 -1）"""
+    def _generate_process_sequence(self, hot_range, cold_range, length, pid=None):
+        rng = self.rng
+        # 一次均匀抽样同时决定冷热区与读写，把 [0, 1) 划分为：
+        # [0, 0.475) 热区写 | [0.475, 0.95) 热区读 | [0.95, 0.995) 冷区读 | [0.995, 1) 冷区写
+        # 即为模拟真实程序的局部性原理95% 概率访问热区页面（写概率 50%），5% 访问冷区页面（写概率 10%）
+        r = rng.random(length)
+        is_hot = r < 0.95
+        hot_addr = rng.integers(hot_range[0], hot_range[1], size=length)    # 热区访问
+        cold_addr = rng.integers(cold_range[0], cold_range[1], size=length) # 冷区访问
+        seq = np.empty(length, dtype=INSTRUCTION_DTYPE)
+        seq["addr"] = np.where(is_hot, hot_addr, cold_addr)
+        seq["is_write"] = (r < 0.475) | (r >= 0.995)
+        seq["pid"] = -1 if pid is None else pid
+        return seq
 
     """模拟生成指令序列"""
     def _generate_instructions(self):
@@ -279,95 +511,125 @@ class PageManager:
                 cold_inst = [500, 600]
                 # 每个进程至少执行 800 条指令
                 length = max(800, self.total_instructions // self.num_processes)
-                process_sequences[pid] = self._generate_process_sequence(hot_inst, cold_inst, length)
+                process_sequences[pid] = self._generate_process_sequence(hot_inst, cold_inst, length, pid)
             #返回分组的序列
-            return self._interleave_sequences(process_sequences)
+            seq = self._interleave_sequences(process_sequences)
         else:
             # 单进程模式
             hot_inst = [0, 40]
             cold_inst = [400, 600]
-            return self._generate_process_sequence(hot_inst,cold_inst,self.total_instructions)
+            seq = self._generate_process_sequence(hot_inst,cold_inst,self.total_instructions)
+        return self._to_instructions(seq)
 
     """模拟时间片 每个进程连续执行 10 条指令后切换"""
     def _interleave_sequences(self, process_sequences):
-        result = []
         burst_size = 10
-        pid_order = list(range(self.num_processes))# pid链表
-        # 最长的进程序列长度
+        num_proc = self.num_processes
+        # 最长的进程序列长度，向上补齐到时间片的整数倍
         max_length = max(len(seq) for seq in process_sequences.values())
-        # 以时间片为步长遍历最长序列
-        for cycle in range(0, max_length, burst_size):
-            for pid in pid_order:
-                sequence = process_sequences[pid]
-                start = cycle
-                end = min(cycle + burst_size, len(sequence))#防止指针溢出
-                for addr, op in sequence[start:end]:
-                    result.append((addr, op, pid))
-        return result   #最终的序列
-
-    """返回当前步骤的详细信息，包括所有算法的执行结果和内存快照"""
-    def step(self):
+        padded_length = -(-max_length // burst_size) * burst_size
+        # 各进程按 pid 顺序排成 (进程, 指令) 二维数组，filled 标记补齐位之外的真实指令
+        grid = np.zeros((num_proc, padded_length), dtype=INSTRUCTION_DTYPE)
+        filled = np.zeros((num_proc, padded_length), dtype=np.bool_)
+        for pid in range(num_proc):
+            sequence = process_sequences[pid]
+            grid[pid, :len(sequence)] = sequence
+            filled[pid, :len(sequence)] = True
+
+        # (进程, 时间片, 片内) -> (时间片, 进程, 片内)，展平即为轮转顺序，再去掉补齐位
+        def by_burst(arr):
+            return arr.reshape(num_proc, -1, burst_size).transpose(1, 0, 2).reshape(-1)
+        return by_burst(grid)[by_burst(filled)]   #最终的序列
+
+    """把结构化数组转换为 (地址, 操作, pid, 页号) 元组列表，页号在此一次算好，step() 直接读取"""
+    def _to_instructions(self, seq):
+        addr = seq["addr"]
+        ops = np.where(seq["is_write"], 'W', 'R')
+        pids = [None if pid == -1 else pid for pid in seq["pid"].tolist()]
+        return list(zip(addr.tolist(), ops.tolist(), pids, (addr // 10).tolist()))
+
+    """无界面批量运行：每个算法依次独立处理接下来的 n 条指令，返回实际处理的条数
+    各算法互不依赖，按算法逐个跑完整段指令，省去逐步构造结果字典和快照"""
+    def run_batch(self, n):
+        start = self.current_time
+        batch = self.instructions[start:start + n]
+        for algo in self.algos.values():
+            algo.process_batch(batch, start, self.page_occurrences)
+        self.current_time += len(batch)
+        return len(batch)
+
+    """无界面运行剩余的全部指令，算法状态与逐步运行到结尾时一致，返回处理的条数"""
+    def run_to_end(self):
+        return self.run_batch(len(self.instructions) - self.current_time)
+
+    """各算法的统计数据 {算法名: (缺页数, 访问数, 写回数)}，百分比由调用方按需计算"""
+    def stats(self):
+        return {
+            name: (algo.miss_count, algo.total_count, algo.write_back_count)
+            for name, algo in self.algos.items()
+        }
+
+    """无界面整段模拟：在编译后的内核中并行跑完全部指令，返回 {算法名: (缺页数, 写回数)}
+    只读取指令序列，不改变交互式逐步运行的状态"""
+    def simulate_all(self):
+        # 延迟导入：只有整段模拟需要 numba，交互界面启动时不加载编译器
+        import memory_model_numba
+
+        pages = self.page_stream
+        is_write = np.array([inst[1] == 'W' for inst in self.instructions], dtype=np.bool_)
+        pids = np.array([-1 if inst[2] is None else inst[2] for inst in self.instructions], dtype=np.int32)
+        next_occ = memory_model_numba.build_next_occurrence(pages)
+        counts = memory_model_numba.run_all(pages, is_write, pids, next_occ, self.memory_blocks)
+        return {
+            name: (int(misses), int(write_backs))
+            for name, (misses, write_backs) in zip(memory_model_numba.ALGO_ORDER, counts)
+        }
+
+    """返回当前步骤的详细信息，包括所有算法的执行结果和内存快照
+    lightweight 为真时跳过快照与预测（memory、next_victim 为 None），供无界面逐步回放使用"""
+    def step(self, lightweight=False):
         #防止溢出
         if self.current_time >= len(self.instructions):
             return None
-        instruction = self.instructions[self.current_time]  #获得当前指令
-        #判断是否存在pid
-        if len(instruction) == 3:
-            addr, op_type, pid = instruction
-        else:
-            addr, op_type = instruction
-            pid = None
+        addr, op_type, pid, page_id = self.instructions[self.current_time]  #获得当前指令
 
         # 并行运行所有算法
-        step_results = {}   #操作信息
-        future_pages = None # 未来页序列
-        page_id = addr // 10
-        for name, algo in self.algos.items():
-            if name == "OPT" and future_pages is None:
-                future_tuples = self.instructions[self.current_time+1:]
-                future_pages = [x[0] // 10 for x in future_tuples]
-
-            #放入页
-            res = algo.process(page_id, op_type, self.current_time, future_pages, pid)
-            miss_rate = (algo.miss_count / algo.total_count) * 100 if algo.total_count > 0 else 0   #缺页率
-            step_results[name] = {
-                "status": res["status"],
-                "swapped": res["swapped"],  #被交换的页号
-                "swapped_pid": res.get("swapped_pid"),
-                "is_write_back": res["is_write_back"],
-                "miss_rate": miss_rate,
-                "miss_count": algo.miss_count,
-                "wb_count": algo.write_back_count
-            }
+        current_time = self.current_time
+        page_occurrences = self.page_occurrences
+        for algo in self.algos.values():
+            #放入页，结果写入 self.step_results 中对应的结果对象
+            algo.process(page_id, op_type, current_time, page_occurrences, pid)
 
         self.current_time += 1
-        # 获取当前查看算法的内存快照和
         view_algo = self.algos[self.view_algo_name] #算法类
-        pred_future = future_pages if self.view_algo_name == "OPT" else None
-        #更新未来序列
-        if self.view_algo_name == "OPT" and pred_future is None:
-            future_tuples = self.instructions[self.current_time:]
-            pred_future = [x[0] // 10 for x in future_tuples]
-        #预测信息
-        next_victim = view_algo.predict_next_victim(pred_future)
-        mem_view = view_algo.get_snapshot(self.current_time)
-
-        return {
-            "inst": addr,
-            "op": op_type,
-            "page": page_id,
-            "pid": pid,
-            "results": step_results,
-            "view_algo": self.view_algo_name,
-            "memory": mem_view,
-            "next_victim": next_victim,
-            "current_step": self.current_time
-        }
+        # 访问结束后页面必在内存中，直接从命中索引取得物理帧号
+        frame = view_algo.page_to_idx[(pid, page_id)]
+        if lightweight:
+            next_victim = mem_view = None
+        else:
+            # 获取当前查看算法的内存快照和
+            #预测信息
+            next_victim = view_algo.predict_next_victim(self.current_time, self.page_occurrences)
+            mem_view = view_algo.get_snapshot(self.current_time)
+
+        return StepResult(
+            inst=addr,
+            op=op_type,
+            page=page_id,
+            pid=pid,
+            frame=frame,
+            results=self.step_results,
+            view_algo=self.view_algo_name,
+            memory=mem_view,
+            next_victim=next_victim,
+            current_step=self.current_time
+        )
 
     """测试序列"""
     def load_belady_sequence(self):
         self.mode = "BELADY"
         pages = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
-        self.instructions = [(p * 10, 'R', None) for p in pages]
+        self.instructions = [(p * 10, 'R', None, p) for p in pages]
+        self._build_page_occurrences()
         self.current_time = 0
         self.reset_algos()
\ No newline at end of file
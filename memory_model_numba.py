@@ -0,0 +1,269 @@
+"""
+页面置换算法的 Numba 编译版本 - 无界面整段模拟
+
+与 memory_model 中各 AlgoState 子类的行为逐条一致，但只使用整数数组保存状态，
+一次调用跑完整条指令流，只返回缺页数和写回数。输入约定：
+- pages:    每条指令的页号 (int32)
+- is_write: 是否为写操作 (bool)
+- pids:     进程号，-1 表示单进程（命中时不比较 pid）
+- next_occ: 同页号下一次出现的位置，不再出现为 len(pages)
+"""
+import numpy as np
+from numba import njit, prange
+
+# run_all 结果的行顺序
+ALGO_ORDER = ("FIFO", "LRU", "OPT", "LINUX", "LINUX_NG")
+
+
+"""从右向左扫描，建立每个位置同页号的下一次出现位置"""
+@njit(cache=True)
+def build_next_occurrence(pages):
+    n = pages.size
+    out = np.full(n, n, dtype=np.int64)
+    if n == 0:
+        return out
+    last = np.full(pages.max() + 1, n, dtype=np.int64)
+    for i in range(n - 1, -1, -1):
+        out[i] = last[pages[i]]
+        last[pages[i]] = i
+    return out
+
+
+"""命中查找：返回帧号，未命中返回 -1"""
+@njit(cache=True)
+def _find(mem_page, mem_pid, filled, page, pid):
+    for i in range(filled):
+        if mem_page[i] == page and (pid == -1 or mem_pid[i] == pid):
+            return i
+    return -1
+
+
+"""在 filled 个帧中取 key 最小的帧"""
+@njit(cache=True)
+def _argmin(key, filled):
+    best = 0
+    for i in range(1, filled):
+        if key[i] < key[best]:
+            best = i
+    return best
+
+
+"""先进先出"""
+@njit(cache=True)
+def simulate_fifo(pages, is_write, pids, blocks):
+    mem_page = np.zeros(blocks, dtype=np.int32)
+    mem_pid = np.zeros(blocks, dtype=np.int32)
+    loaded_at = np.zeros(blocks, dtype=np.int64)
+    dirty = np.zeros(blocks, dtype=np.bool_)
+    filled = 0
+    misses = 0
+    write_backs = 0
+    for t in range(pages.size):
+        idx = _find(mem_page, mem_pid, filled, pages[t], pids[t])
+        if idx != -1:
+            if is_write[t]:
+                dirty[idx] = True
+            continue
+        misses += 1
+        if filled < blocks:
+            idx = filled
+            filled += 1
+        else:
+            idx = _argmin(loaded_at, filled)
+            if dirty[idx]:
+                write_backs += 1
+        mem_page[idx] = pages[t]
+        mem_pid[idx] = pids[t]
+        loaded_at[idx] = misses
+        dirty[idx] = is_write[t]
+    return misses, write_backs
+
+
+"""最久未使用"""
+@njit(cache=True)
+def simulate_lru(pages, is_write, pids, blocks):
+    mem_page = np.zeros(blocks, dtype=np.int32)
+    mem_pid = np.zeros(blocks, dtype=np.int32)
+    last_access = np.zeros(blocks, dtype=np.int64)
+    dirty = np.zeros(blocks, dtype=np.bool_)
+    filled = 0
+    misses = 0
+    write_backs = 0
+    for t in range(pages.size):
+        idx = _find(mem_page, mem_pid, filled, pages[t], pids[t])
+        if idx != -1:
+            last_access[idx] = t
+            if is_write[t]:
+                dirty[idx] = True
+            continue
+        misses += 1
+        if filled < blocks:
+            idx = filled
+            filled += 1
+        else:
+            idx = _argmin(last_access, filled)
+            if dirty[idx]:
+                write_backs += 1
+        mem_page[idx] = pages[t]
+        mem_pid[idx] = pids[t]
+        last_access[idx] = t
+        dirty[idx] = is_write[t]
+    return misses, write_backs
+
+
+"""最优置换：last_ref 记录帧最近一次被访问的位置，沿 next_occ 链找到 t 之后的下一次使用"""
+@njit(cache=True)
+def simulate_opt(pages, is_write, pids, next_occ, blocks):
+    n = pages.size
+    mem_page = np.zeros(blocks, dtype=np.int32)
+    mem_pid = np.zeros(blocks, dtype=np.int32)
+    last_ref = np.zeros(blocks, dtype=np.int64)
+    dirty = np.zeros(blocks, dtype=np.bool_)
+    filled = 0
+    misses = 0
+    write_backs = 0
+    for t in range(n):
+        idx = _find(mem_page, mem_pid, filled, pages[t], pids[t])
+        if idx != -1:
+            last_ref[idx] = t
+            if is_write[t]:
+                dirty[idx] = True
+            continue
+        misses += 1
+        if filled < blocks:
+            idx = filled
+            filled += 1
+        else:
+            idx = -1
+            max_dist = -1
+            for i in range(blocks):
+                nxt = next_occ[last_ref[i]]
+                while nxt <= t:
+                    nxt = next_occ[nxt]
+                if nxt == n:    # 未来不再使用
+                    idx = i
+                    break
+                if nxt > max_dist:
+                    max_dist = nxt
+                    idx = i
+            if dirty[idx]:
+                write_backs += 1
+        mem_page[idx] = pages[t]
+        mem_pid[idx] = pids[t]
+        last_ref[idx] = t
+        dirty[idx] = is_write[t]
+    return misses, write_backs
+
+
+"""LINUX: Clock 算法"""
+@njit(cache=True)
+def simulate_clock(pages, is_write, pids, blocks):
+    mem_page = np.zeros(blocks, dtype=np.int32)
+    mem_pid = np.zeros(blocks, dtype=np.int32)
+    ref_bit = np.zeros(blocks, dtype=np.bool_)
+    dirty = np.zeros(blocks, dtype=np.bool_)
+    hand = 0
+    filled = 0
+    misses = 0
+    write_backs = 0
+    for t in range(pages.size):
+        idx = _find(mem_page, mem_pid, filled, pages[t], pids[t])
+        if idx != -1:
+            ref_bit[idx] = True
+            if is_write[t]:
+                dirty[idx] = True
+            continue
+        misses += 1
+        if filled < blocks:
+            idx = filled
+            filled += 1
+        else:
+            # 引用位为 1 的帧清零后跳过，最多转 2 圈 + 1
+            idx = hand
+            for _ in range(2 * blocks + 1):
+                if not ref_bit[idx]:
+                    break
+                ref_bit[idx] = False
+                idx = (idx + 1) % blocks
+            if dirty[idx]:
+                write_backs += 1
+        mem_page[idx] = pages[t]
+        mem_pid[idx] = pids[t]
+        ref_bit[idx] = True
+        dirty[idx] = is_write[t]
+        hand = (idx + 1) % blocks
+    return misses, write_backs
+
+
+"""LINUX_NG: Active/Inactive 两个列表"""
+@njit(cache=True)
+def simulate_linux_ng(pages, is_write, pids, blocks):
+    mem_page = np.zeros(blocks, dtype=np.int32)
+    mem_pid = np.zeros(blocks, dtype=np.int32)
+    last_access = np.zeros(blocks, dtype=np.int64)
+    dirty = np.zeros(blocks, dtype=np.bool_)
+    is_active = np.zeros(blocks, dtype=np.bool_)
+    active_count = 0
+    filled = 0
+    misses = 0
+    write_backs = 0
+    for t in range(pages.size):
+        idx = _find(mem_page, mem_pid, filled, pages[t], pids[t])
+        if idx != -1:
+            last_access[idx] = t
+            if not is_active[idx]:
+                is_active[idx] = True
+                active_count += 1
+                # Active 列表超过一半时，把其中最久未用的页降级
+                if active_count > blocks // 2:
+                    oldest = -1
+                    for i in range(filled):
+                        if is_active[i] and (oldest == -1 or last_access[i] < last_access[oldest]):
+                            oldest = i
+                    is_active[oldest] = False
+                    active_count -= 1
+            if is_write[t]:
+                dirty[idx] = True
+            continue
+        misses += 1
+        if filled < blocks:
+            idx = filled
+            filled += 1
+        else:
+            # 优先在 Inactive 列表中做 LRU，列表为空则在全体中做 LRU
+            idx = -1
+            for i in range(filled):
+                if not is_active[i] and (idx == -1 or last_access[i] < last_access[idx]):
+                    idx = i
+            if idx == -1:
+                idx = _argmin(last_access, filled)
+            if is_active[idx]:
+                active_count -= 1
+            if dirty[idx]:
+                write_backs += 1
+        mem_page[idx] = pages[t]
+        mem_pid[idx] = pids[t]
+        last_access[idx] = t
+        dirty[idx] = is_write[t]
+        is_active[idx] = False
+    return misses, write_backs
+
+
+"""五种算法互相独立，用 prange 并行跑完整条指令流，返回 (5, 2) 的 [缺页数, 写回数]"""
+@njit(cache=True, parallel=True)
+def run_all(pages, is_write, pids, next_occ, blocks):
+    out = np.zeros((len(ALGO_ORDER), 2), dtype=np.int64)
+    for a in prange(len(ALGO_ORDER)):
+        if a == 0:
+            misses, write_backs = simulate_fifo(pages, is_write, pids, blocks)
+        elif a == 1:
+            misses, write_backs = simulate_lru(pages, is_write, pids, blocks)
+        elif a == 2:
+            misses, write_backs = simulate_opt(pages, is_write, pids, next_occ, blocks)
+        elif a == 3:
+            misses, write_backs = simulate_clock(pages, is_write, pids, blocks)
+        else:
+            misses, write_backs = simulate_linux_ng(pages, is_write, pids, blocks)
+        out[a, 0] = misses
+        out[a, 1] = write_backs
+    return out
@@ -1,44 +1,111 @@
-import math
+import asyncio
+import time
+from collections import deque
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Container
 from textual.widgets import Footer, Static, Button, RichLog, Label, Input, Log
 from textual.reactive import reactive
 from textual_plotext import PlotextPlot
-from textual.events import Blur, Click
+from textual.events import Blur, Click, DescendantBlur, DescendantFocus
 
 from memory_model import PageManager
 
+# 单步日志的固定片段与模板
+STATUS_HIT = "[green]HIT [/]"
+STATUS_MISS = "[red]MISS[/]"
+OP_W = "[blue]WR[/]"
+OP_R = "RD"
+WB_MARK = " [bold yellow](WB)[/]"
+PHYS_TMPL = "Fr:{fr} → Phys:{ph:>3}"
+MSG_TMPL = "{st} │ {op} │ [cyan]Addr:{addr:>3}[/] → Pg:{pg:>2} Off:{off} → [green]{phys}[/]"
+MSG_TMPL_PID = "[P{pid}] " + MSG_TMPL
+SWAP_TMPL = " │ Swap: {pid}Pg{page:>2}{wb}"
+
+# 内存块网格列数，按块数（0-10）索引：≤4 块 2 列，5-6 块 3 列，更多 4 列
+GRID_COLS_BY_COUNT = (2, 2, 2, 2, 2, 3, 3, 4, 4, 4, 4)
+
+class StepBatch:
+    """模拟协程每拍产出的显示数据，卡片数据已复制，不受后续步骤原地更新影响"""
+    __slots__ = ("cards", "memory", "next_victim")
+
+    def __init__(self, cards, memory, next_victim):
+        self.cards = cards              # [(算法名, 缺页率, 写回数, 状态)]
+        self.memory = memory
+        self.next_victim = next_victim
+
 class SmartInput(Input):
     """智能输入框：失去焦点时自动提交"""
+    _last_submitted = None  # 最近一次提交（回车或失焦）或被重置的值，失焦时与之相同则不再提交
+
+    def on_mount(self) -> None:
+        self._last_submitted = self.value
+
+    async def action_submit(self) -> None:
+        self._last_submitted = self.value
+        await super().action_submit()
+
     def on_blur(self, event: Blur) -> None:
+        # 仅经过（Tab 切换、点击别处）而未修改时，不触发内存块重建流程
+        if self.value == self._last_submitted:
+            return
+        self._last_submitted = self.value
         self.post_message(self.Submitted(self, self.value))
 
+    def reset_value(self, value: str) -> None:
+        """把非法输入恢复为当前生效的值"""
+        self.value = value
+        self._last_submitted = value
+
 class AlgoStatCard(Static):
     """
     算法统计卡片组件
 
     显示单个算法的缺页率、写回数和当前状态
     """
+    # 热路径上频繁访问的字段放入槽位（Textual 基类仍保留 __dict__）
+    __slots__ = ("algo_name", "_title_lbl", "_rate_lbl", "_wb_lbl", "_status_lbl",
+                 "_last_rate", "_last_wb", "_last_status")
+
     def __init__(self, algo_name):
         super().__init__(id=f"card-{algo_name.lower().replace('+','p')}")
         self.algo_name = algo_name
+        # 子标签在构造时创建并持有引用，更新时无需查询
+        self._title_lbl = Label(self.algo_name, classes="card-title")
+        self._rate_lbl = Label("0.0%", classes="card-rate")
+        self._wb_lbl = Label("WB: 0", classes="card-wb")
+        self._status_lbl = Label("--", classes="card-status")
+        # 上次显示的内容；初始为 None，保证第一次更新时完整设置文字与状态类
+        self._last_rate = None
+        self._last_wb = None
+        self._last_status = None
 
     def compose(self) -> ComposeResult:
-        yield Label(self.algo_name, classes="card-title")
-        yield Label("0.0%", classes="card-rate")
-        yield Label("WB: 0", classes="card-wb")
-        yield Label("--", classes="card-status")
+        yield self._title_lbl
+        yield self._rate_lbl
+        yield self._wb_lbl
+        yield self._status_lbl
 
     def update_data(self, miss_rate: float, wb_count: int, status: str):
-        """更新卡片数据"""
-        self.query_one(".card-rate").update(f"{miss_rate:.1f}%")
-        self.query_one(".card-wb").update(f"WB: {wb_count}")
+        """更新卡片数据，只更新内容发生变化的标签"""
+        rate_text = f"{miss_rate:.1f}%"
+        if rate_text != self._last_rate:
+            self._last_rate = rate_text
+            self._rate_lbl.update(rate_text)
+        if wb_count != self._last_wb:
+            self._last_wb = wb_count
+            self._wb_lbl.update(f"WB: {wb_count}")
+        if status == self._last_status:
+            return
+        self._last_status = status
 
-        status_lbl = self.query_one(".card-status")
+        status_lbl = self._status_lbl
         status_lbl.update(status)
 
-        # 动态设置状态样式
-        status_lbl.classes = "card-status status-miss" if status == "Miss" else "card-status status-hit"
+        # 动态设置状态样式：只翻转两个状态类
+        is_miss = status == "Miss"
+        status_lbl.set_class(is_miss, "status-miss")
+        status_lbl.set_class(not is_miss, "status-hit")
 
     def reset(self):
         """重置显示"""
@@ -58,58 +125,129 @@ class MemBlock(Static):
 
     根据传入的状态数据自我渲染样式和文字
     """
-    frame_idx = reactive("0")
-    page_num = reactive("--")
-    meta_info = reactive("")
+    # 热路径上频繁访问的字段放入槽位（Textual 基类仍保留 __dict__）
+    __slots__ = ("_idx_text", "_idx_lbl", "_page_lbl", "_meta_lbl", "_last_key", "_applied_classes")
+
+    # 标签文字：值真正变化时才由 watch_ 方法写入对应标签；标签自身会重绘，块本身无需重绘
+    frame_idx = reactive("#0", repaint=False)
+    page_num = reactive("--", repaint=False)
+    meta_info = reactive("", repaint=False)
+
+    # 各显示状态对应的样式类组合，预先建好供 _apply_classes 直接比较
+    CLASSES_EMPTY = frozenset({"block-empty"})
+    CLASSES_VICTIM = frozenset({"block-active", "victim-frame"})
+    CLASSES_DIRTY = frozenset({"block-active", "block-dirty"})
+    CLASSES_LIST_ACTIVE = frozenset({"block-active", "block-list-active"})
+    CLASSES_HAND = frozenset({"block-active", "clock-hand-frame"})
+    CLASSES_LIST_INACTIVE = frozenset({"block-active", "block-list-inactive"})
+    CLASSES_PLAIN = frozenset({"block-active"})
+
+    def __init__(self, frame: int = 0, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 帧号固定不变，构造时生成一次标签文字
+        self._idx_text = f"#{frame}"
+        # 子标签在构造时创建并持有引用，更新时无需查询
+        self._idx_lbl = Label(self._idx_text, classes="mem-idx")
+        self._page_lbl = Label("--", classes="mem-page")
+        self._meta_lbl = Label("", classes="mem-meta")
+        self._last_key = None   # 上次渲染时的显示状态
+        self._applied_classes = frozenset()   # 当前已应用的状态类
 
     def compose(self) -> ComposeResult:
-        yield Label(f"#{self.frame_idx}", classes="mem-idx")
-        yield Label(self.page_num, classes="mem-page")
-        yield Label(self.meta_info, classes="mem-meta")
+        yield self._idx_lbl
+        yield self._page_lbl
+        yield self._meta_lbl
+
+    def watch_frame_idx(self, value: str) -> None:
+        self._idx_lbl.update(value)
+
+    def watch_page_num(self, value: str) -> None:
+        self._page_lbl.update(value)
+
+    def watch_meta_info(self, value: str) -> None:
+        self._meta_lbl.update(value)
+
+    def set_mode(self, mode: str):
+        """按运行模式绑定 update_state，逐帧更新时不再判断模式"""
+        self.update_state = self._update_state_multi if mode == "multi" else self._update_state_single
+        self._last_key = None   # 模式变化后强制重绘
+
+    def _update_state_single(self, data: dict, is_victim: bool, view_algo_name: str):
+        """单进程模式：帧号标签只显示帧号"""
+        self._render_state(self._idx_text, data, is_victim, view_algo_name)
 
-    def update_state(self, idx: int, data: dict, is_victim: bool, view_algo_name: str, mode: str = "single"):
+    def _update_state_multi(self, data: dict, is_victim: bool, view_algo_name: str):
+        """多进程模式：帧号标签附带进程 ID"""
+        if data is not None and data["pid"] is not None:
+            self._render_state(f"{self._idx_text} P{data['pid']}", data, is_victim, view_algo_name)
+        else:
+            self._render_state(self._idx_text, data, is_victim, view_algo_name)
+
+    # 默认按单进程模式显示
+    update_state = _update_state_single
+
+    def _render_state(self, idx_text: str, data: dict, is_victim: bool, view_algo_name: str):
         """
         根据逻辑层数据更新视图
 
         Args:
-            idx: 内存帧号
+            idx_text: 帧号标签文字
             data: 页帧数据（None 表示空闲）
             is_victim: 是否为下一个被置换的候选帧
             view_algo_name: 当前查看的算法名称
-            mode: "single" 或 "multi"
         """
-        # 更新帧号（多进程模式下显示进程 ID）
-        if mode == "multi" and data and data.get("pid") is not None:
-            self.query_one(".mem-idx").update(f"#{idx} P{data['pid']}")
+        # 显示内容与上次完全相同时跳过，避免无谓的标签更新和重绘
+        if data is None:
+            key = (idx_text, None)
         else:
-            self.query_one(".mem-idx").update(f"#{idx}")
+            page, meta = data["page"], data["meta"]
+            is_dirty, is_active_list, is_hand = data["is_dirty"], data["is_active_list"], data["is_hand"]
+            key = (idx_text, page, meta, is_victim, is_dirty, is_active_list, is_hand, view_algo_name)
+        if key == self._last_key:
+            return
+        self._last_key = key
 
-        # 清除旧的状态类
-        self.classes = ""
+        # 更新帧号（多进程模式下含进程 ID）
+        self.frame_idx = idx_text
 
         if data is None:
             # 空闲帧
-            self.query_one(".mem-page").update("--")
-            self.query_one(".mem-meta").update("EMPTY")
-            self.add_class("block-empty")
+            self.page_num = "--"
+            self.meta_info = "EMPTY"
+            self._apply_classes(self.CLASSES_EMPTY)
             return
 
         # 更新页面信息
-        self.query_one(".mem-page").update(str(data["page"]))
-        self.query_one(".mem-meta").update(data["meta"])
+        self.page_num = str(page)
+        self.meta_info = meta
 
-        # 应用样式（按优先级）
-        self.add_class("block-active")
+        # 应用样式（按优先级选出一组预建的类组合）
         if is_victim:
-            self.add_class("victim-frame")
-        elif data.get("is_dirty"):
-            self.add_class("block-dirty")
-        elif data.get("is_active_list"):  # LINUX_NG Active 列表
-            self.add_class("block-list-active")
-        elif data.get("is_hand"):  # Clock 算法指针
-            self.add_class("clock-hand-frame")
+            desired = self.CLASSES_VICTIM
+        elif is_dirty:
+            desired = self.CLASSES_DIRTY
+        elif is_active_list:  # LINUX_NG Active 列表
+            desired = self.CLASSES_LIST_ACTIVE
+        elif is_hand:  # Clock 算法指针
+            desired = self.CLASSES_HAND
         elif view_algo_name == "LINUX_NG":  # LINUX_NG Inactive 列表
-            self.add_class("block-list-inactive")
+            desired = self.CLASSES_LIST_INACTIVE
+        else:
+            desired = self.CLASSES_PLAIN
+        self._apply_classes(desired)
+
+    def _apply_classes(self, desired: frozenset):
+        """只增删与当前不同的状态类，避免整体重设 classes"""
+        applied = self._applied_classes
+        if desired == applied:
+            return
+        stale = applied - desired
+        if stale:
+            self.remove_class(*stale)
+        fresh = desired - applied
+        if fresh:
+            self.add_class(*fresh)
+        self._applied_classes = desired
 
 
 class MemSimApp(App):
@@ -120,26 +258,72 @@ class MemSimApp(App):
         ("space", "toggle", "Start/Pause"),
         ("r", "reset", "Reset"),
         ("ctrl+c", "quit", "Quit"),
-        ("q", "quit", "Quit")
+        ("q", "quit", "Quit"),
+        ("=", "faster", "Speed+"),
+        ("-", "slower", "Speed-")
     ]
 
+    HISTORY_LEN = 60    # 趋势图保留的数据点数
+    MIN_YIELD = 0.005   # 模拟协程每拍至少让出事件循环的时间（秒）
+    ADVANCE_CHUNK = 32  # 一拍内连续推进多少步后让出一次事件循环
+    LOG_FLUSH_MAX = 40  # 每次合并写入日志的最多行数
+    SHORT_SEQUENCE = 50 # 指令数少于此值的序列（如 Belady 演示）每拍只推进一步，便于逐步观察
+
+    # 输入框 id -> (下限, 上限, 错误提示名, 当前值属性, 修改方法)
+    INPUT_SPECS = {
+        "input-size": (1, 10, "Size", "current_blocks", "change_memory_size"),
+        "input-proc": (1, 5, "Proc", "current_processes", "change_process_count"),
+    }
+
     def __init__(self):
         super().__init__()
         self.current_blocks = 4
         self.current_processes = 1
         self.logic = PageManager(memory_blocks=self.current_blocks, mode="single", num_processes=1)
-        self.timer = None
         self.sim_running = False
-        self.plot_data_x = []
-        self.plot_data_y = []
+        # 模拟节拍频率与每拍推进的模拟步数（默认 20 Hz × 5 步，即每秒 100 步）
+        self.ui_hz = 20
+        # 渲染与模拟解耦：模拟协程只覆盖写入最新一拍的数据，渲染定时器按固定帧率取走绘制；
+        # 渲染频率不高于模拟节拍，否则多出的唤醒都取不到新数据
+        self.render_hz = self.ui_hz
+        self._pending_batch = None
+        self._sim_finished = False  # 指令序列已跑完，等待渲染定时器收尾
+        self.steps_per_tick = 5
+        # 命中每 _log_every 步输出一条逐步日志（缺页总是输出）；加速后按比例抽稀命中日志
+        self._log_every = 1
+        # 图表刷新节流：每渲染 _chart_every 拍数据才重绘一次（20 Hz / 5，约 4 Hz）
+        self._tick_counter = 0
+        self._chart_every = 5
+        # 逐步日志先以原始数据缓存（只保留最新 LOG_FLUSH_MAX 条），由定时器格式化后合并为一次写入
+        self._log_buf = deque(maxlen=self.LOG_FLUSH_MAX)
+        self._log_count = 0     # 上次写入以来记录的日志条数，含被挤出缓存的
         self.mem_block_refs = []
-
-        # 为每个算法维护独立的历史数据
+        # 常用控件引用，在 on_mount 中缓存，避免每帧重复查询 DOM
+        self.card_refs = {}
+        self.btn_refs = {}
+        self.btn_algos = {}     # 按钮 id -> 算法名，点击时直接查表
+        self.log_ref = None
+        self.start_btn = None
+        self.plot_widget = None
+        self.chart_plt = None   # plot_widget 的 Plotext 绘图对象
+        self.memory_panel = None
+        # 渲染与日志定时器只在模拟运行期间工作，暂停、结束或未开始时不唤醒
+        self._render_timer = None
+        self._log_timer = None
+        # 当前高亮的卡片与按钮（compose 时 FIFO 按钮默认高亮）
+        self._active_card = None
+        self._active_btn = "FIFO"
+        self._focused_input = None  # 当前获得焦点的输入框
+
+        # 为每个算法维护独立的历史数据：只存缺页率，横坐标由全局步数在绘图时推出
         self.algo_names = ["FIFO", "LRU", "OPT", "LINUX", "LINUX_NG"]
         self.algo_histories = {
-            name: {'x': [], 'y': []}
+            name: deque(maxlen=self.HISTORY_LEN)
             for name in self.algo_names
         }
+        self._global_step = 0   # 已记录的步数，即最新数据点的横坐标
+        self._chart_dirty = False   # 上次绘图后是否有新的数据点
+        self._chart_empty = True    # 图表当前是否没有数据
 
     def compose(self) -> ComposeResult:
         yield Label("Virtual Memory Simulator", classes="app-title")
@@ -178,58 +362,67 @@ class MemSimApp(App):
         yield Footer()
 
     async def on_mount(self):
-        self.query_one("#sys-log").write("System Initialized.")
+        self.card_refs = {
+            name: self.query_one(f"#card-{name.lower().replace('+', 'p')}", AlgoStatCard)
+            for name in self.algo_names
+        }
+        self.btn_refs = {name: self.query_one(f"#btn-{name.lower()}", Button) for name in self.algo_names}
+        self.btn_algos = {btn.id: name for name, btn in self.btn_refs.items()}
+        self.log_ref = self.query_one("#sys-log", RichLog)
+        self.start_btn = self.query_one("#btn-start", Button)
+        self.plot_widget = self.query_one("#miss-chart-plot", PlotextPlot)
+        self.chart_plt = self.plot_widget.plt
+        self.memory_panel = self.query_one("#memory-panel")
+
+        self.log_ref.write("System Initialized.")
+        self._log_timer = self.set_interval(0.2, self._flush_log, pause=True)
+        self._render_timer = self.set_interval(1.0 / self.render_hz, self._flush_ui, pause=True)
         self.update_active_card_highlight("FIFO")
         self.init_chart()
         await self.change_memory_size(self.current_blocks)
 
     def init_chart(self):
-        plt = self.query_one("#miss-chart-plot", PlotextPlot).plt
+        plt = self.chart_plt
         plt.title("Miss Rate Trend") 
         plt.theme("pro")
         plt.xlabel("") 
         plt.ylabel("Miss %")
         plt.ylim(0, 100)
 
+    def on_descendant_focus(self, event: DescendantFocus) -> None:
+        """记录获得焦点的输入框，点击处理时无需再解析当前焦点"""
+        if isinstance(event.widget, SmartInput):
+            self._focused_input = event.widget
+
+    def on_descendant_blur(self, event: DescendantBlur) -> None:
+        if event.widget is self._focused_input:
+            self._focused_input = None
+
     def on_click(self, event: Click) -> None:
         """全局点击处理：点击非交互区时让输入框失焦"""
-        focused = self.focused
-        if focused and focused.id == "input-size":
-            if event.widget != focused and not event.widget.can_focus:
-                self.set_focus(None)
+        focused = self._focused_input
+        if focused is not None and event.widget is not focused and not event.widget.can_focus:
+            self.set_focus(None)
 
     async def on_input_submitted(self, event: Input.Submitted):
         """处理内存大小和进程数修改"""
-        if event.input.id == "input-size":
-            try:
-                if not event.value:
-                    return
-                val = int(event.value)
-                if val == self.current_blocks:
-                    return
-
-                if 1 <= val <= 10:
-                    await self.change_memory_size(val)
-                else:
-                    self.query_one("#sys-log").write("[red]Error: Size must be 1-10[/]")
-                    event.input.value = str(self.current_blocks)
-            except ValueError:
-                pass
-        elif event.input.id == "input-proc":
-            try:
-                if not event.value:
-                    return
-                val = int(event.value)
-                if val == self.current_processes:
-                    return
-
-                if 1 <= val <= 5:
-                    await self.change_process_count(val)
-                else:
-                    self.query_one("#sys-log").write("[red]Error: Proc must be 1-5[/]")
-                    event.input.value = str(self.current_processes)
-            except ValueError:
-                pass
+        spec = self.INPUT_SPECS.get(event.input.id)
+        if spec is None or not event.value:
+            return
+        low, high, label, attr, handler = spec
+        try:
+            val = int(event.value)
+        except ValueError:
+            return
+        current = getattr(self, attr)
+        if val == current:
+            return
+
+        if low <= val <= high:
+            await getattr(self, handler)(val)
+        else:
+            self.log_ref.write(f"[red]Error: {label} must be {low}-{high}[/]")
+            event.input.reset_value(str(current))
 
     def on_button_pressed(self, event):
         """处理按钮点击事件"""
@@ -238,16 +431,17 @@ class MemSimApp(App):
             self.action_toggle()
         elif bid == "btn-belady":
             self.start_belady_demo()
-        elif bid.startswith("btn-"):
-            algo_tag = bid.replace("btn-", "").upper()
-            self.set_view_algorithm(algo_tag)
+        else:
+            algo = self.btn_algos.get(bid)
+            if algo is not None:
+                self.set_view_algorithm(algo)
 
     async def change_process_count(self, count):
         """修改进程数量"""
         self._stop_simulation()
         self.current_processes = count
         mode = "multi" if count > 1 else "single"
-        self.query_one("#sys-log").write(f"Setting {count} process(es), mode: {mode}...")
+        self.log_ref.write(f"Setting {count} process(es), mode: {mode}...")
 
         # 重置逻辑层（保持当前内存大小）
         self.logic = PageManager(
@@ -261,14 +455,15 @@ class MemSimApp(App):
         self.set_view_algorithm("FIFO")
 
         # 更新内存块显示
-        for i, block in enumerate(self.mem_block_refs):
-            block.update_state(i, None, False, "FIFO", mode)
+        for block in self.mem_block_refs:
+            block.set_mode(mode)
+            block.update_state(None, False, "FIFO")
 
     async def change_memory_size(self, size):
         """修改内存大小"""
         self._stop_simulation()
         self.current_blocks = size
-        self.query_one("#sys-log").write(f"Resizing to {size} blocks...")
+        self.log_ref.write(f"Resizing to {size} blocks...")
 
         # 重置逻辑层（保持当前进程数和模式）
         mode = "multi" if self.current_processes > 1 else "single"
@@ -280,24 +475,32 @@ class MemSimApp(App):
         if self.logic.mode == "BELADY":
             self.logic.load_belady_sequence()
 
-        # 重建内存块 UI
-        panel = self.query_one("#memory-panel")
-        await panel.remove_children()
-        self.mem_block_refs = [MemBlock() for _ in range(size)]
-        await panel.mount(*self.mem_block_refs)
+        # 调整内存块 UI：只增删差额部分，保留的块原地复用
+        panel = self.memory_panel
+        blocks = self.mem_block_refs
+        old_size = len(blocks)
+        if size < old_size:
+            await panel.remove_children(blocks[size:])
+            del blocks[size:]
+        elif size > old_size:
+            new_blocks = [MemBlock(i) for i in range(old_size, size)]
+            blocks.extend(new_blocks)
+            await panel.mount(*new_blocks)
+        for block in blocks:
+            block.set_mode(mode)
+            block.update_state(None, False, "FIFO")
 
         self.update_memory_grid_layout(size)
 
         # 重置图表和状态
-        self.plot_data_x = []
-        self.plot_data_y = []
+        self._chart_dirty = True
         self.refresh_chart()
         self.update_ui_reset()
 
     def update_memory_grid_layout(self, count):
-        cols = 2 if count <= 4 else (3 if count <= 6 else 4)
-        rows = math.ceil(count / cols)
-        panel = self.query_one("#memory-panel")
+        cols = GRID_COLS_BY_COUNT[count]
+        rows = -(-count // cols)
+        panel = self.memory_panel
         panel.styles.grid_size_columns = cols
         panel.styles.grid_size_rows = rows
 
@@ -307,48 +510,80 @@ class MemSimApp(App):
         self.logic.load_belady_sequence()
         self.reset_views()
         
-        log = self.query_one("#sys-log")
+        log = self.log_ref
         log.clear()
-        log.write("[bold magenta]=== Belady's Anomaly Demo ===[/]")
-        log.write("Seq: 1,2,3,4,1,2,5,1,2,3,4,5")
-        log.write("1. Set RAM to 3 -> Run -> Check Faults (Expected: 9)")
-        log.write("2. Set RAM to 4 -> Run -> Check Faults (Expected: 10)")
+        # 说明文字合并为一次写入
+        log.write("\n".join((
+            "[bold magenta]=== Belady's Anomaly Demo ===[/]",
+            "Seq: 1,2,3,4,1,2,5,1,2,3,4,5",
+            "1. Set RAM to 3 -> Run -> Check Faults (Expected: 9)",
+            "2. Set RAM to 4 -> Run -> Check Faults (Expected: 10)",
+        )))
 
     def set_view_algorithm(self, algo):
+        # 新建的 PageManager 会把逻辑层视图重置为 FIFO，因此界面与逻辑层都一致才算未变化
+        unchanged = algo == self._active_btn and algo == self.logic.view_algo_name
         self.logic.view_algo_name = algo
-        self.query_one("#sys-log").write(f"View: {algo}")
+        self._flush_log()   # 保证切换提示出现在已执行步骤的日志之后
+        self.log_ref.write(f"View: {algo}")   # 重置后也要提示当前查看的算法
+        if unchanged:
+            return  # 按钮、卡片与图表都无需更新
 
-        for b_id in ["btn-fifo", "btn-lru", "btn-opt", "btn-linux", "btn-linux_ng"]:
-            btn = self.query_one(f"#{b_id}")
-            suffix = b_id.replace("btn-","").upper();
-            btn.variant = "primary" if suffix == algo else "default"
+        # 只切换前后两个按钮的样式
+        if algo != self._active_btn:
+            self.btn_refs[self._active_btn].variant = "default"
+            self.btn_refs[algo].variant = "primary"
+            self._active_btn = algo
 
         self.update_active_card_highlight(algo)
-        self.plot_data_x = []
-        self.plot_data_y = []
+        self._chart_dirty = True    # 换了要显示的序列，必须重画
         self.refresh_chart()
 
     def update_active_card_highlight(self, active_algo):
-        for algo in ["FIFO", "LRU", "OPT", "LINUX", "LINUX_NG"]:
-            # 处理特殊 ID 字符
-            card_id = f"#card-{algo.lower().replace('+', 'p')}"
-            try:
-                card = self.query_one(card_id, AlgoStatCard)
-                card.set_active(algo == active_algo)
-            except:
-                pass
+        if active_algo == self._active_card:
+            return
+        if self._active_card is not None:
+            self.card_refs[self._active_card].set_active(False)
+        self.card_refs[active_algo].set_active(True)
+        self._active_card = active_algo
 
     def action_toggle(self):
         self.sim_running = not self.sim_running
-        btn = self.query_one("#btn-start")
+        btn = self.start_btn
         if self.sim_running:
             btn.label = "PAUSE"
             btn.add_class("pause")
-            self.timer = self.set_interval(0.01, self.step_simulation)
+            self._sim_worker()
         else:
             btn.label = "RESUME"
             btn.remove_class("pause")
-            if self.timer: self.timer.stop()
+
+    def action_faster(self):
+        """每拍推进的步数加倍"""
+        self.steps_per_tick = min(self.steps_per_tick * 2, 640)
+        self._update_log_every()
+        self._report_speed()
+
+    def action_slower(self):
+        """每拍推进的步数减半"""
+        self.steps_per_tick = max(self.steps_per_tick // 2, 1)
+        self._update_log_every()
+        self._report_speed()
+
+    def _effective_steps_per_tick(self):
+        """实际每拍推进的步数：短序列固定每拍一步，其余按 steps_per_tick"""
+        if len(self.logic.instructions) < self.SHORT_SEQUENCE:
+            return 1
+        return self.steps_per_tick
+
+    def _report_speed(self):
+        """按实际每拍步数输出当前速度"""
+        self._flush_log()
+        self.log_ref.write(f"Speed: {self._effective_steps_per_tick() * self.ui_hz} steps/s")
+
+    def _update_log_every(self):
+        """按每拍步数计算日志抽稀间隔（默认每拍 5 步时逐步输出）"""
+        self._log_every = max(1, self.steps_per_tick // 5)
 
     def action_reset(self):
         """响应 'r' 键重置模拟"""
@@ -356,149 +591,213 @@ class MemSimApp(App):
         self.logic.reset()
         self.reset_views()
         self.set_view_algorithm("FIFO")
-        for i, block in enumerate(self.mem_block_refs):
-            block.update_state(i, None, False, "FIFO", self.logic.mode)
-        self.query_one("#sys-log").write("[bold red]System Reset.[/]")
+        for block in self.mem_block_refs:
+            block.update_state(None, False, "FIFO")
+        self.log_ref.write("[bold red]System Reset.[/]")
 
     def _stop_simulation(self):
         """停止模拟并重置按钮状态"""
         self.sim_running = False
-        if self.timer:
-            self.timer.stop()
-        btn = self.query_one("#btn-start")
+        self.workers.cancel_group(self, "sim")
+        # 丢弃尚未渲染的数据，协程只在 await 处被取消，此后不会再写入
+        self._pending_batch = None
+        self._sim_finished = False
+        self._flush_log()
+        self._pause_timers()
+        btn = self.start_btn
         btn.label = "START"
         btn.remove_class("pause")
 
     def reset_views(self):
         """重置所有视图和历史数据"""
-        for name in self.algo_names:
-            self.algo_histories[name] = {'x': [], 'y': []}
+        for hist in self.algo_histories.values():
+            hist.clear()
+        self._global_step = 0
 
+        self._chart_dirty = True
         self.refresh_chart()
         self.update_ui_reset()
 
     def refresh_chart(self):
-        """刷新缺页率趋势图"""
-        plot_widget = self.query_one("#miss-chart-plot", PlotextPlot)
-        plt = plot_widget.plt
-        plt.clear_data()
-
-        current_algo = self.logic.view_algo_name
-        data = self.algo_histories.get(current_algo, {'x': [], 'y': []})
-
-        if data['x']:
-            plt.plot(data['x'], data['y'], color="red", marker="dot")
-
-        plot_widget.refresh()
+        """刷新缺页率趋势图，自上次绘制以来没有变化时直接返回"""
+        if not self._chart_dirty:
+            return
+        self._chart_dirty = False
+        history = self.algo_histories[self.logic.view_algo_name]
+        # 重置后反复触发时，图表本来就是空的，无需清空重画
+        if not history and self._chart_empty:
+            return
+        self._chart_empty = not history
+
+        plt = self.chart_plt
+        plt.clear_data()    # 标题与坐标轴在 init_chart 中设置一次，这里只替换数据
+        ys = list(history)
+
+        if ys:
+            end = self._global_step + 1
+            # 点数多于图表列数时按步长抽样（保留最新一点），同一列上的点不必重复光栅化
+            n = len(ys)
+            width = self.plot_widget.size.width
+            stride = -(-n // width) if 0 < width < n else 1
+            first = (n - 1) % stride
+            plt.plot(list(range(end - n + first, end, stride)), ys[first::stride], color="red", marker="dot")
+
+        self.plot_widget.refresh()
+
+    @work(exclusive=True, group="sim")
+    async def _sim_worker(self):
+        """模拟协程：按节拍推进模型，只保留最新一拍的显示数据，由渲染定时器取走"""
+        self._render_timer.resume()
+        self._log_timer.resume()
+        clock = time.perf_counter
+        while self.sim_running:
+            t0 = clock()
+            batch = await self._advance()
+            if batch is None:
+                self._sim_finished = True
+                break
+            self._pending_batch = batch     # 未来得及渲染的旧数据直接被覆盖
+            # 扣除本拍推进耗时，使实际步速贴近 steps_per_tick × ui_hz；
+            # 推进本身已超过一拍时也至少让出 MIN_YIELD，保证渲染和输入能得到处理
+            elapsed = clock() - t0
+            await asyncio.sleep(max(1.0 / self.ui_hz - elapsed, self.MIN_YIELD))
+
+        # 暂停或跑完：立即画完最后一拍并收尾，随后停掉定时器，空闲期间不再唤醒
+        self._flush_ui()
+        self._flush_log()
+        self._pause_timers()
+
+    def _pause_timers(self):
+        """暂停渲染与日志定时器，下次启动模拟协程时恢复"""
+        self._render_timer.pause()
+        self._log_timer.pause()
+
+    async def _advance(self):
+        """推进 steps_per_tick 步并记录每步的历史与日志，返回本拍最后一步的显示数据，序列已结束时返回 None
+        每 ADVANCE_CHUNK 步让出一次事件循环，高速档下按键和点击不会被整拍推进卡住；
+        让出期间的停止、重置等操作会在 await 处取消本协程，不会与模型修改交错"""
+        logic = self.logic
+        total = len(logic.instructions)
+        n = self._effective_steps_per_tick()
+        chunk = self.ADVANCE_CHUNK
+        res = None
+        for i in range(n):
+            if logic.current_time >= total:
+                break
+            if i and i % chunk == 0:
+                await asyncio.sleep(0)
+            # 中间步骤跳过快照与预测；节拍内最后一步（或整个序列最后一条）取完整结果用于显示
+            full = i == n - 1 or logic.current_time == total - 1
+            res = logic.step(lightweight=not full)
+            self._record_step(res)
 
-    def step_simulation(self):
-        """执行单步模拟并更新UI"""
-        res = self.logic.step()
         if res is None:
+            return None
+        cards = [(name, data.miss_rate, data.wb_count, data.status) for name, data in res.results.items()]
+        return StepBatch(cards, res.memory, res.next_victim)
+
+    def _flush_ui(self):
+        """渲染定时器：绘制最新一拍的数据；序列结束时先画完最后一拍再收尾"""
+        batch = self._pending_batch
+        if batch is not None:
+            self._pending_batch = None
+            self._render_batch(batch)
+        if self._sim_finished:
             self._stop_simulation()
-            self.query_one("#btn-start").label = "FINISHED"
-            self.query_one("#btn-start").remove_class("pause")
+            self.start_btn.label = "FINISHED"
+            self.start_btn.remove_class("pause")
+            self.refresh_chart()    # 补画节流期间未显示的最后几个点
 
             # Belady 异常结果检查
             if self.logic.mode == "BELADY" and self.logic.view_algo_name == "FIFO":
                 misses = self.logic.algos["FIFO"].miss_count
-                self.query_one("#sys-log").write(f"[magenta]Result: {self.current_blocks} Blocks -> {misses} Misses[/]")
+                self.log_ref.write(f"[magenta]Result: {self.current_blocks} Blocks -> {misses} Misses[/]")
+
+    def _render_batch(self, batch: StepBatch):
+        """一次性渲染一拍数据"""
+        # 整拍的卡片、图表与内存块修改合并为一次重绘
+        with self.batch_update():
+            # 1. 批量更新统计卡片
+            card_refs = self.card_refs
+            for name, miss_rate, wb_count, status in batch.cards:
+                card_refs[name].update_data(miss_rate, wb_count, status)
+
+            # 2. 刷新图表（显示当前选定算法的数据），按节流间隔重绘，没有新数据时 refresh_chart 直接返回；
+            #    终端太小、图表区域被挤没时跳过，脏标记保留到下次可见时再画
+            self._tick_counter += 1
+            if self._tick_counter % self._chart_every == 0 and self.plot_widget.region:
+                self.refresh_chart()
+
+            # 3. 批量更新内存块：受害帧标记一次算好，zip 在块、快照与标记上同步迭代（以最短者为准）
+            victim_idx = batch.next_victim
+            mem_data = batch.memory
+            limit = min(len(self.mem_block_refs), len(mem_data))
+            victim_flags = [False] * limit
+            if 0 <= victim_idx < limit:
+                victim_flags[victim_idx] = True
+            view_algo_name = self.logic.view_algo_name
+
+            for block, data, is_victim in zip(self.mem_block_refs, mem_data, victim_flags):
+                block.update_state(data, is_victim, view_algo_name)
+
+    def _record_step(self, res):
+        """记录每一步的绘图数据与日志（结果对象会被下一步原地覆盖，必须立即处理）"""
+        current_algo_res = res.results[res.view_algo]
+        histories = self.algo_histories
+        for name, data in res.results.items():
+            # 记录每个算法的绘图数据（定长队列自动丢弃最旧的点）
+            histories[name].append(data.miss_rate)
+        self._global_step += 1
+        self._chart_dirty = True
+
+        # 缺页每步都记录；命中只按抽稀间隔记录，被跳过的步骤不构造日志字符串
+        is_miss = current_algo_res.status == "Miss"
+        if not is_miss and res.current_step % self._log_every:
             return
 
-        # 1. 批量更新统计卡片
-        current_algo_res = None
-        for name, data in res["results"].items():
-            card_id = f"#card-{name.lower().replace('+', 'p')}"
-            try:
-                card = self.query_one(card_id, AlgoStatCard)
-                card.update_data(data['miss_rate'], data['wb_count'], data['status'])
-            except:
-                pass
-
-            # 记录每个算法的绘图数据
-            hist = self.algo_histories[name]
-            hist['x'].append(res['current_step'])
-            hist['y'].append(data['miss_rate'])
-            # 限制数据长度，防止无限增长
-            if len(hist['x']) > 60:
-                hist['x'].pop(0)
-                hist['y'].pop(0)
-
-            if name == res["view_algo"]:
-                current_algo_res = data
-
-        # 2. 刷新图表（显示当前选定算法的数据）
-        self.refresh_chart()
-
-        # 3. 批量更新内存块
-        victim_idx = res["next_victim"]
-        mem_data = res["memory"]
-        limit = min(len(self.mem_block_refs), len(mem_data))
-
-        for i in range(limit):
-            block = self.mem_block_refs[i]
-            data = mem_data[i]
-            is_victim = (i == victim_idx)
-            block.update_state(i, data, is_victim, self.logic.view_algo_name, self.logic.mode)
-
-        # 4. 打印详细日志
-        addr = res["inst"]
-        page_id = res["page"]
-        page_offset = addr % 10
-
-        # 进程 ID 标识（多进程模式）
-        pid_str = ""
-        if self.logic.mode == "multi" and res.get("pid") is not None:
-            pid_str = f"P{res['pid']}"
-
-        # 查找物理帧号
-        physical_frame = -1
-        for i, frame_data in enumerate(mem_data):
-            if frame_data and frame_data["page"] == page_id:
-                # 多进程模式下需要匹配 PID
-                if self.logic.mode == "single" or frame_data.get("pid") == res.get("pid"):
-                    physical_frame = i
-                    break
-
-        # 构建格式化日志
-        proc_info = f"{pid_str:>2}" if pid_str else "  "  # 进程ID，右对齐2字符
-
-        status_str = "[red]MISS[/]" if current_algo_res["status"] == "Miss" else "[green]HIT [/]"
-        op_str = "[blue]WR[/]" if res["op"] == 'W' else "RD"
-
-        # 地址信息格式化
-        virt_addr = f"Addr:{addr:>3}"
-        page_info = f"Pg:{page_id:>2}"
-        offset_info = f"Off:{page_offset}"
-
-        # 物理地址信息
-        if physical_frame != -1:
-            physical_addr = physical_frame * 10 + page_offset
-            phys_info = f"Fr:{physical_frame} → Phys:{physical_addr:>3}"
-        else:
-            phys_info = "Fr:- → Phys:---"
-
-        # 组装基础日志
-        if pid_str:
-            msg = f"[{proc_info}] {status_str} │ {op_str} │ [cyan]{virt_addr}[/] → {page_info} {offset_info} → [green]{phys_info}[/]"
-        else:
-            msg = f"{status_str} │ {op_str} │ [cyan]{virt_addr}[/] → {page_info} {offset_info} → [green]{phys_info}[/]"
-
-        # 添加换出信息
-        if current_algo_res["swapped"] is not None:
-            swap_pid_str = ""
-            if self.logic.mode == "multi" and current_algo_res.get("swapped_pid") is not None:
-                swap_pid_str = f"P{current_algo_res['swapped_pid']}:"
-            wb_mark = " [bold yellow](WB)[/]" if current_algo_res["is_write_back"] else ""
-            msg += f" │ Swap: {swap_pid_str}Pg{current_algo_res['swapped']:>2}{wb_mark}"
-
-        self.query_one("#sys-log").write(msg)
+        # 只拷贝生成日志所需的字段，格式化推迟到写入时，只对真正写出的行进行
+        self._log_count += 1
+        self._log_buf.append((
+            res.inst, res.page, res.pid, res.frame, is_miss, res.op == 'W',
+            current_algo_res.swapped, current_algo_res.swapped_pid, current_algo_res.is_write_back
+        ))
+
+    def _flush_log(self):
+        """把缓存的逐步日志格式化后合并为一次写入；高速档下缺页过多时只写最新的 LOG_FLUSH_MAX 条，
+        避免一次排版数百行长时间占住事件循环"""
+        buf = self._log_buf
+        if not buf:
+            return
+        lines = []
+        skipped = self._log_count - len(buf)
+        if skipped:
+            lines.append(f"[dim]… {skipped} lines skipped[/]")
+        # 多进程模式下带进程 ID 前缀（模式只判断一次）
+        multi = self.logic.mode == "multi"
+        for addr, page_id, pid, frame, is_miss, is_write, swapped, swapped_pid, is_write_back in buf:
+            # 固定片段与模板见模块顶部，每行只填入变化的数字；物理帧号由逻辑层直接给出
+            page_offset = addr % 10
+            phys_info = PHYS_TMPL.format(fr=frame, ph=frame * 10 + page_offset)
+            tmpl = MSG_TMPL_PID if multi and pid is not None else MSG_TMPL
+            msg = tmpl.format(
+                pid=pid,
+                st=STATUS_MISS if is_miss else STATUS_HIT,
+                op=OP_W if is_write else OP_R,
+                addr=addr, pg=page_id, off=page_offset, phys=phys_info
+            )
+
+            # 添加换出信息
+            if swapped is not None:
+                swap_pid_str = f"P{swapped_pid}:" if multi and swapped_pid is not None else ""
+                wb_mark = WB_MARK if is_write_back else ""
+                msg += SWAP_TMPL.format(pid=swap_pid_str, page=swapped, wb=wb_mark)
+            lines.append(msg)
+
+        self.log_ref.write("\n".join(lines))
+        buf.clear()
+        self._log_count = 0
 
     def update_ui_reset(self):
         """重置所有卡片显示"""
-        for algo in ["FIFO", "LRU", "OPT", "LINUX", "LINUX_NG"]:
-            card_id = f"#card-{algo.lower().replace('+', 'p')}"
-            try:
-                self.query_one(card_id, AlgoStatCard).reset()
-            except:
-                pass
+        for card in self.card_refs.values():
+            card.reset()
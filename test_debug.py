@@ -13,8 +13,7 @@ mgr1 = PageManager(total_instructions=100, memory_blocks=4, mode="single", num_p
 print(f"Total instructions generated: {len(mgr1.instructions)}")
 print(f"First 10 instructions (should have pid=None):")
 for i, inst in enumerate(mgr1.instructions[:10]):
-    addr, op, pid = inst if len(inst) == 3 else (*inst, None)
-    page = addr // 10
+    addr, op, pid, page = inst
     print(f"  {i}: addr={addr}, page={page}, op={op}, pid={pid}")
 
 # Test 2: Multi process mode
@@ -25,8 +24,7 @@ print(f"Total instructions generated: {len(mgr5.instructions)}")
 # Check uniqueness of (pid, page) combinations
 pid_page_combinations = set()
 for inst in mgr5.instructions[:100]:
-    addr, op, pid = inst
-    page = addr // 10
+    addr, op, pid, page = inst
     pid_page_combinations.add((pid, page))
 
 print(f"\nUnique (pid, page) combinations in first 100 instructions: {len(pid_page_combinations)}")
@@ -35,10 +33,8 @@ print(f"Actual combinations: {sorted(pid_page_combinations)[:20]}")
 
 # Test 3: Run a few steps and check memory
 print("\n### Test 3: Running simulation for 20 steps ###")
-for step in range(20):
-    result = mgr5.step()
-    if result is None:
-        break
+# Advance in batch without building per-step results
+mgr5.run_batch(20)
 
 print(f"\nFIFO Stats after 20 steps:")
 print(f"  Total: {mgr5.algos['FIFO'].total_count}")
@@ -46,8 +42,22 @@ print(f"  Misses: {mgr5.algos['FIFO'].miss_count}")
 print(f"  Miss Rate: {mgr5.algos['FIFO'].miss_count / mgr5.algos['FIFO'].total_count * 100:.1f}%")
 
 print(f"\nMemory state (FIFO):")
-for i, frame in enumerate(mgr5.algos['FIFO'].memory):
+for i, frame in enumerate(mgr5.algos['FIFO'].get_snapshot(mgr5.current_time)):
     if frame:
         print(f"  Frame {i}: pid={frame.get('pid')}, page={frame['page']}")
     else:
         print(f"  Frame {i}: Empty")
+
+# Test 4: Run the remaining instructions and cross-check against the compiled simulation
+print("\n### Test 4: Batch run to end vs compiled simulate_all ###")
+mgr5.run_to_end()
+compiled = mgr5.simulate_all()
+mismatched = []
+for name, (misses, total, write_backs) in mgr5.stats().items():
+    c_misses, c_write_backs = compiled[name]
+    match = "OK" if (misses, write_backs) == (c_misses, c_write_backs) else "MISMATCH"
+    if match != "OK":
+        mismatched.append(name)
+    print(f"  {name:<8} misses={misses:>3} wb={write_backs:>3} | compiled misses={c_misses:>3} wb={c_write_backs:>3} [{match}]")
+if mismatched:
+    raise AssertionError(f"Compiled simulation diverges from batch run for: {', '.join(mismatched)}")